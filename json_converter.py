@@ -1,70 +1,218 @@
-import pandas as pd
 import json
 import os
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def convert_excel_to_json_parts(items_per_part=200, language="japanese"):
+# Single-file alternative to p1.json, p2.json, ... (one JSON object per line)
+PARTS_MANIFEST = "parts.ndjson"
+# Start of every compact manifest line, which is followed by the part number
+_MANIFEST_LINE_PREFIX = b'{"part":'
+
+
+# Keys are never sorted: insertion order is the Excel row order or the schema
+# order, which the parts, the translated output and final.json must all keep.
+if orjson is not None:
+    _COMPACT_OPTIONS = orjson.OPT_APPEND_NEWLINE
+    _INDENT_OPTIONS = _COMPACT_OPTIONS | orjson.OPT_INDENT_2
+
+
+def dumps_json(data, indent=False):
+    """Serialize data to newline-terminated UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=_INDENT_OPTIONS if indent else _COMPACT_OPTIONS)
+    if indent:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return (text + '\n').encode('utf-8')
+
+
+def loads_json(raw):
+    """Parse JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps_part(part_data):
     """
-    Convert Output_Final.xlsx to multiple JSON parts.
+    Serialize a part dictionary exactly as it is written to a pN.json file.
     
     Args:
-        items_per_part (int): Number of items per JSON part, default 200
-        language (str): Language folder name, default "japanese"
+        part_data (dict): Part dictionary
+    
+    Returns:
+        str: Compact, newline-terminated JSON text
+    """
+    return dumps_json(part_data).decode('utf-8')
+
+
+def _write_json_files(tasks, indent=False, max_workers=8):
+    """
+    Write JSON part files concurrently.
+    
+    Args:
+        tasks (list): List of (filepath, data) tuples; each file is independent
+        indent (bool): Pretty-print with 2-space indentation, default False (compact)
+        max_workers (int): Maximum number of writer threads, default 8
+    """
+    if not tasks:
+        return
+    
+    def write_one(task):
+        filepath, data = task
+        Path(filepath).write_bytes(dumps_json(data, indent))
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        # Consume the iterator so any write error is raised here
+        list(executor.map(write_one, tasks))
+
+
+def _write_parts(parts, output_path, indent=False, unit="items"):
+    """
+    Write part dictionaries to p1.json, p2.json, ... in the output folder.
+    
+    Args:
+        parts (list): List of part dictionaries, in part order
+        output_path (Path): Folder to write the part files into
+        indent (bool): Pretty-print the parts for debugging, default False (compact)
+        unit (str): Name of a top-level entry used in progress messages
     
     Returns:
         list: List of created JSON file paths
     """
-    # Define file paths
-    excel_file = "source/Output_Final.xlsx"
-    parts_folder = Path("parts") / language
+    tasks = [(output_path / f"p{part_num}.json", part_data) for part_num, part_data in enumerate(parts, 1)]
     
-    # Create parts folder if it doesn't exist
-    parts_folder.mkdir(parents=True, exist_ok=True)
+    # A leftover manifest would take precedence over the new part files
+    (output_path / PARTS_MANIFEST).unlink(missing_ok=True)
+    
+    # Write all part files concurrently
+    _write_json_files(tasks, indent)
+    
+    json_files = []
+    for filepath, part_data in tasks:
+        json_files.append(str(filepath))
+        print(f"Created {filepath} with {len(part_data)} {unit}")
+    
+    print(f"\nConversion complete! Created {len(tasks)} JSON parts in {output_path}")
+    
+    return json_files
+
+
+def _write_parts_manifest(parts, output_path):
+    """
+    Write part dictionaries to a single NDJSON manifest in the output folder.
+    Line N holds {"part": N, "data": {...}} for what would otherwise be pN.json.
+    
+    Args:
+        parts (list): List of part dictionaries, in part order
+        output_path (Path): Folder to write the manifest into
+    
+    Returns:
+        list: Single-item list with the manifest path
+    """
+    manifest_path = output_path / PARTS_MANIFEST
+    with open(manifest_path, 'wb') as f:
+        for part_num, part_data in enumerate(parts, 1):
+            f.write(dumps_json({"part": part_num, "data": part_data}))
+    
+    print(f"\nConversion complete! Wrote {len(parts)} JSON parts to {manifest_path}")
+    
+    return [str(manifest_path)]
+
+
+def load_parts_manifest(parts_dir):
+    """
+    Read the NDJSON parts manifest from a parts folder.
+    
+    Args:
+        parts_dir (str | Path): Parts folder containing parts.ndjson
+    
+    Returns:
+        dict: Part name (e.g. "p1") -> part dictionary, in part order
+    """
+    parts = {}
+    with open(Path(parts_dir) / PARTS_MANIFEST, 'rb') as f:
+        for line in f:
+            if line.strip():
+                record = loads_json(line)
+                parts[f"p{record['part']}"] = record["data"]
+    return dict(sorted(parts.items(), key=lambda item: int(item[0][1:])))
+
+
+def list_parts_manifest(parts_dir):
+    """
+    List the part names in the NDJSON parts manifest without parsing the part data.
+    
+    Args:
+        parts_dir (str | Path): Parts folder containing parts.ndjson
+    
+    Returns:
+        list: Part names (e.g. "p1"), in part order
+    """
+    part_nums = []
+    with open(Path(parts_dir) / PARTS_MANIFEST, 'rb') as f:
+        for line in f:
+            if line.startswith(_MANIFEST_LINE_PREFIX):
+                # The part number sits between the prefix and the first comma
+                part_nums.append(int(line[len(_MANIFEST_LINE_PREFIX):line.index(b',', len(_MANIFEST_LINE_PREFIX))]))
+            elif line.strip():
+                part_nums.append(loads_json(line)["part"])
+    return [f"p{part_num}" for part_num in sorted(part_nums)]
+
+
+def convert_excel_to_json_parts_inmem(items_per_part=200):
+    """
+    Split the keys of Output_Final.xlsx into JSON part dictionaries without writing them.
+    
+    Args:
+        items_per_part (int): Number of items per JSON part, default 200
+    
+    Returns:
+        list: List of part dictionaries (key -> ""), in part order
+    """
+    # Imported here so that status checks and JSON-only runs don't load openpyxl
+    from openpyxl import load_workbook
+    
+    excel_file = "source/Output_Final.xlsx"
     
     try:
-        # Read the Excel file
-        df = pd.read_excel(excel_file)
+        # Stream only the first column (below the header row) of the first sheet as keys;
+        # wb.active would be whichever sheet was selected when the workbook was saved
+        wb = load_workbook(excel_file, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            keys = [
+                row[0]
+                for row in ws.iter_rows(min_row=2, max_col=1, values_only=True)
+                if row and row[0] is not None
+            ]
+        finally:
+            wb.close()
         
-        # Get the first column as keys
-        if df.empty:
+        if not keys:
             print("Excel file is empty")
             return []
         
-        keys = df.iloc[:, 0].tolist()
-        
         # Create JSON parts
-        json_files = []
         total_items = len(keys)
         total_parts = (total_items + items_per_part - 1) // items_per_part  # Ceiling division
         
-        for part_num in range(1, total_parts + 1):
-            start_idx = (part_num - 1) * items_per_part
-            end_idx = min(start_idx + items_per_part, total_items)
-            
-            # Create JSON object for this part
-            part_data = {}
-            for key in keys[start_idx:end_idx]:
-                if pd.isna(key):  # Handle NaN values
-                    part_data[str(key)] = ""
-                else:
-                    part_data[str(key)] = ""
-            
-            # Create filename
-            filename = f"p{part_num}.json"
-            filepath = parts_folder / filename
-            
-            # Write JSON file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(part_data, f, ensure_ascii=False, indent=2)
-            
-            json_files.append(str(filepath))
-            print(f"Created {filepath} with {len(part_data)} items")
+        parts = []
+        keys_iter = iter(keys)
+        for _ in range(total_parts):
+            # Create JSON object for the next items_per_part keys, each mapped to ""
+            parts.append(dict.fromkeys(map(str, islice(keys_iter, items_per_part)), ""))
         
-        print(f"\nConversion complete! Created {total_parts} JSON parts in {parts_folder}")
         print(f"Total items processed: {total_items}")
         
-        return json_files
+        return parts
         
     except FileNotFoundError:
         print(f"Error: Excel file '{excel_file}' not found")
@@ -74,65 +222,61 @@ def convert_excel_to_json_parts(items_per_part=200, language="japanese"):
         return []
 
 
-def convert_json_to_parts(max_lines_per_part=500, language="japanese"):
+def convert_excel_to_json_parts(items_per_part=200, language="japanese", indent=False, manifest=False):
     """
-    Convert large JSON file to multiple smaller JSON parts based on line counts.
+    Convert Output_Final.xlsx to multiple JSON parts.
     
     Args:
-        input_file (str): Path to the input JSON file, default "source/en.default.schema.json"
-        max_lines_per_part (int): Maximum lines per JSON part, default 500
-        output_folder (str): Output folder for parts, default "parts"
+        items_per_part (int): Number of items per JSON part, default 200
+        language (str): Language folder name, default "japanese"
+        indent (bool): Pretty-print the parts for debugging, default False (compact)
+        manifest (bool): Write a single parts.ndjson instead of pN.json files, default False
     
     Returns:
         list: List of created JSON file paths
     """
-    import json
-    from pathlib import Path
+    parts_folder = Path("parts") / language
+    
+    # Create parts folder if it doesn't exist
+    parts_folder.mkdir(parents=True, exist_ok=True)
+    
+    parts = convert_excel_to_json_parts_inmem(items_per_part)
+    if not parts:
+        return []
+    
+    try:
+        if manifest:
+            return _write_parts_manifest(parts, parts_folder)
+        return _write_parts(parts, parts_folder, indent, unit="items")
+    except Exception as e:
+        print(f"Error writing JSON parts: {str(e)}")
+        return []
 
+
+def convert_json_to_parts_inmem(max_lines_per_part=500):
+    """
+    Split the JSON schema into part dictionaries based on line counts, without writing them.
+    Each top-level key is treated as a section and sections are never split.
+    
+    Args:
+        max_lines_per_part (int): Maximum lines per JSON part, default 500
+    
+    Returns:
+        list: List of part dictionaries, in part order
+    """
     input_file="source/en.default.schema.json"
-    # Create output folder if it doesn't exist
-    output_path = Path("parts") / language
-    output_path.mkdir(parents=True, exist_ok=True)
     
     try:
         # Read the JSON file
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = loads_json(Path(input_file).read_bytes())
         
-        # Get all lines to analyze structure
-        with open(input_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Find section boundaries by analyzing the JSON structure
+        # Treat each top-level key as a section, sized by its pretty-printed line count
+        # (the serialized bytes are newline-terminated, so counting b'\n' counts lines)
         sections = []
-        current_section = None
-        current_start_line = 0
-        
-        for i, line in enumerate(lines):
-            # Look for top-level sections (keys at root level)
-            stripped = line.strip()
-            if stripped.startswith('"') and stripped.endswith(': {') and not line.startswith('    '):
-                # This is a top-level section
-                if current_section:
-                    sections.append({
-                        'name': current_section,
-                        'start_line': current_start_line,
-                        'end_line': i - 1,
-                        'line_count': i - current_start_line
-                    })
-                
-                # Extract section name
-                section_name = stripped.split('"')[1]
-                current_section = section_name
-                current_start_line = i
-        
-        # Add the last section
-        if current_section:
+        for section_name, section_value in data.items():
             sections.append({
-                'name': current_section,
-                'start_line': current_start_line,
-                'end_line': len(lines) - 1,
-                'line_count': len(lines) - current_start_line
+                'name': section_name,
+                'line_count': dumps_json(section_value, indent=True).count(b'\n')
             })
         
         print(f"Found {len(sections)} sections:")
@@ -166,31 +310,13 @@ def convert_json_to_parts(max_lines_per_part=500, language="japanese"):
             print(f"  Part {i+1}: {total_lines} lines - {', '.join(section_names)}")
         
         # Create JSON parts
-        json_files = []
-        for part_num, group in enumerate(grouped_sections, 1):
-            # Create JSON object for this part
-            part_data = {}
-            for section in group:
-                section_name = section['name']
-                if section_name in data:
-                    part_data[section_name] = data[section_name]
-            
-            # Create filename
-            filename = f"p{part_num}.json"
-            filepath = output_path / filename
-            
-            # Write JSON file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(part_data, f, ensure_ascii=False, indent=2)
-            
-            json_files.append(str(filepath))
-            total_lines = sum(s['line_count'] for s in group)
-            print(f"Created {filepath} with {len(group)} sections ({total_lines} lines)")
+        parts = []
+        for group in grouped_sections:
+            parts.append({section['name']: data[section['name']] for section in group})
         
-        print(f"\nConversion complete! Created {len(grouped_sections)} JSON parts in {output_path}")
         print(f"Total sections processed: {len(sections)}")
         
-        return json_files
+        return parts
         
     except FileNotFoundError:
         print(f"Error: JSON file '{input_file}' not found")
@@ -203,6 +329,37 @@ def convert_json_to_parts(max_lines_per_part=500, language="japanese"):
         return []
 
 
+def convert_json_to_parts(max_lines_per_part=500, language="japanese", indent=False, manifest=False):
+    """
+    Convert large JSON file to multiple smaller JSON parts based on line counts.
+    Each top-level key is treated as a section and sections are never split.
+    
+    Args:
+        max_lines_per_part (int): Maximum lines per JSON part, default 500
+        language (str): Language folder name, default "japanese"
+        indent (bool): Pretty-print the parts for debugging, default False (compact)
+        manifest (bool): Write a single parts.ndjson instead of pN.json files, default False
+    
+    Returns:
+        list: List of created JSON file paths
+    """
+    # Create output folder if it doesn't exist
+    output_path = Path("parts") / language
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    parts = convert_json_to_parts_inmem(max_lines_per_part)
+    if not parts:
+        return []
+    
+    try:
+        if manifest:
+            return _write_parts_manifest(parts, output_path)
+        return _write_parts(parts, output_path, indent, unit="sections")
+    except Exception as e:
+        print(f"Error writing JSON parts: {str(e)}")
+        return []
+
+
 if __name__ == "__main__":
     # Example usage
     # print("Converting Excel to JSON parts...")
@@ -8,49 +8,83 @@ import os
 import sys
 import argparse
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 # Import our modules
-from json_converter import convert_excel_to_json_parts, convert_json_to_parts
-from translate import translate_single_json_file, translate_all_json_files, get_translation_status
-from merge import merge_json_files_to_final_json, merge_json_files_to_xlsx, get_merge_status
+from json_converter import (
+    convert_excel_to_json_parts,
+    convert_excel_to_json_parts_inmem,
+    convert_json_to_parts,
+    convert_json_to_parts_inmem,
+    list_parts_manifest,
+    PARTS_MANIFEST,
+)
+from translate import translate_single_json_file, translate_all_json_files, translate_all_dicts, get_translation_status
+from merge import merge_json_files_to_final_json, merge_json_files_to_parquet, merge_json_files_to_xlsx, get_merge_status
 from text_to_json import process_translation_file
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('translation_pipeline.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def start_logging() -> logging.handlers.QueueListener:
+    """
+    Route all log records to translation_pipeline.log and stdout for a CLI run.
+    Console records are written directly, so they stay in order with print() output;
+    file records are only queued on the calling thread, and the returned listener
+    writes them to disk from a background thread and must be stopped to flush the queue.
+    
+    Returns:
+        QueueListener: The started listener
+    """
+    log_queue = queue.Queue(-1)
+    log_listener = logging.handlers.QueueListener(
+        log_queue,
+        logging.FileHandler('translation_pipeline.log')
+    )
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.handlers.QueueHandler(log_queue),
+            logging.StreamHandler(sys.stdout)
+        ],
+        force=True
+    )
+    log_listener.start()
+    return log_listener
+
 class TranslationPipeline:
     """Main translation pipeline that orchestrates all steps."""
     
-    def __init__(self, language: str = "japanese", input_type: str = "json", items_per_part: int = 500, max_lines_per_part: int = 500):
+    def __init__(self, language: str = "japanese", input_type: str = "json", items_per_part: int = 500, max_lines_per_part: int = 500,
+                 parts_manifest: bool = False, parquet_output: bool = False):
         self.language = language
         self.items_per_part = items_per_part
         self.max_lines_per_part = max_lines_per_part
         self.input_type = input_type
+        self.parts_manifest = parts_manifest
+        self.parquet_output = parquet_output
+        self.parts_dir = Path("parts") / language
+        self.excel_path = Path("source/Output_Final.xlsx")
+        self.json_path = Path("source/en.default.schema.json")
         self.api_key = os.getenv("GEMINI_API_KEY")
         
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
     
-    def run_full_pipeline(self) -> Dict:
+    def run_full_pipeline(self, persist_parts: bool = True) -> Dict:
         """
         Run the complete translation pipeline from Excel to final Excel.
         
         Args:
-            clean_output (bool): Whether to clean existing output files
+            persist_parts (bool): Write JSON parts to parts/{language} before translating.
+                When False the parts are handed to the translator in memory.
             
         Returns:
             dict: Pipeline execution results
@@ -68,19 +102,33 @@ class TranslationPipeline:
             
             # Step 1: Convert Excel to JSON parts
             logger.info("📋 Step 1: Converting Excel to JSON parts...")
-            if self.input_type == "excel":
-                json_files = convert_excel_to_json_parts(self.items_per_part, self.language)
+            if not persist_parts:
+                if self.input_type == "excel":
+                    parts = convert_excel_to_json_parts_inmem(self.items_per_part)
+                else:
+                    parts = convert_json_to_parts_inmem(self.max_lines_per_part)
+                if not parts:
+                    results["errors"].append("Failed to convert Excel to JSON parts")
+                    return results
+                results["steps"]["json_conversion"] = {"success": True, "parts": len(parts)}
+                logger.info(f"✅ Step 1 complete: {len(parts)} JSON parts kept in memory")
             else:
-                json_files = convert_json_to_parts(self.max_lines_per_part, self.language)
-            if not json_files:
-                results["errors"].append("Failed to convert Excel to JSON parts")
-                return results
-            results["steps"]["json_conversion"] = {"success": True, "files": json_files}
-            logger.info(f"✅ Step 1 complete: {len(json_files)} JSON parts created")
+                if self.input_type == "excel":
+                    json_files = convert_excel_to_json_parts(self.items_per_part, self.language, manifest=self.parts_manifest)
+                else:
+                    json_files = convert_json_to_parts(self.max_lines_per_part, self.language, manifest=self.parts_manifest)
+                if not json_files:
+                    results["errors"].append("Failed to convert Excel to JSON parts")
+                    return results
+                results["steps"]["json_conversion"] = {"success": True, "files": json_files}
+                logger.info(f"✅ Step 1 complete: {len(json_files)} JSON parts created")
             
             # Step 2: Translate all JSON files
             logger.info("🌐 Step 2: Translating all JSON files...")
-            translation_success = translate_all_json_files(self.language)
+            if not persist_parts:
+                translation_success = translate_all_dicts(self.language, parts)
+            else:
+                translation_success = translate_all_json_files(self.language)
             if not translation_success:
                 results["errors"].append("Failed to translate JSON files")
                 return results
@@ -89,7 +137,9 @@ class TranslationPipeline:
             
             # Step 3: Merge to final Excel
             logger.info("📊 Step 3: Merging to final Excel...")
-            if self.input_type == "excel":
+            if self.input_type == "excel" and self.parquet_output:
+                merge_success = merge_json_files_to_parquet(self.language)
+            elif self.input_type == "excel":
                 merge_success = merge_json_files_to_xlsx(self.language)
             else:
                 merge_success = merge_json_files_to_final_json(self.language)
@@ -138,9 +188,9 @@ class TranslationPipeline:
             if convert_to_json:
                 logger.info("📋 Step 1: Converting language file to JSON parts...")
                 if self.input_type == "excel":
-                    json_files = convert_excel_to_json_parts(self.items_per_part, self.language)
+                    json_files = convert_excel_to_json_parts(self.items_per_part, self.language, manifest=self.parts_manifest)
                 else:
-                    json_files = convert_json_to_parts(self.max_lines_per_part, self.language)
+                    json_files = convert_json_to_parts(self.max_lines_per_part, self.language, manifest=self.parts_manifest)
                 if not json_files:
                     results["errors"].append("Failed to convert Excel or JSON to JSON parts")
                     return results
@@ -149,19 +199,7 @@ class TranslationPipeline:
             else:
                 logger.info("📋 Step 1: Skipping Excel or JSON to JSON parts conversion")
 
-            # Check if JSON parts exist
-            parts_dir = Path("parts") / self.language
-            if not parts_dir.exists():
-                results["errors"].append(f"Parts directory not found: {parts_dir}")
-                return results
-            
-            # Check if the specific file exists
-            source_file = parts_dir / f"{file_name}.json"
-            if not source_file.exists():
-                results["errors"].append(f"Source file not found: {source_file}")
-                return results
-            
-            # Step 2: Translate single file
+            # Step 2: Translate single file (a missing part is reported by the translator)
             logger.info(f"🌐 Step 2: Translating {file_name}.json...")
             translation_success = translate_single_json_file(self.language, file_name)
             if not translation_success:
@@ -173,7 +211,9 @@ class TranslationPipeline:
 
             # Step 3: Merge to final file
             logger.info("📊 Step 3: Merging to final file...")
-            if self.input_type == "excel":
+            if self.input_type == "excel" and self.parquet_output:
+                merge_success = merge_json_files_to_parquet(self.language)
+            elif self.input_type == "excel":
                 merge_success = merge_json_files_to_xlsx(self.language)
             else:
                 merge_success = merge_json_files_to_final_json(self.language)
@@ -207,37 +247,40 @@ class TranslationPipeline:
             }
             
             # Check Excel source
-            if self.input_type == "excel":
-                excel_file = Path("source/Output_Final.xlsx")
-            else:
-                json_file = Path("source/en.default.schema.json")
-
             if self.input_type == "excel":
                 status["excel_source"] = {
-                    "exists": excel_file.exists(),
-                    "path": str(excel_file)
+                    "exists": self.excel_path.exists(),
+                    "path": str(self.excel_path)
                 }
 
             else:
                 status["json_source"] = {
-                    "exists": json_file.exists(),
-                    "path": str(json_file)
+                    "exists": self.json_path.exists(),
+                    "path": str(self.json_path)
                 }
 
-            # Check JSON parts
-            parts_dir = Path("parts") / self.language
-            if parts_dir.exists():
-                json_files = list(parts_dir.glob("*.json"))
+            # Check JSON parts with a single directory scan, shared with the translation status
+            if self.parts_dir.exists():
+                with os.scandir(self.parts_dir) as entries:
+                    file_names = [entry.name for entry in entries if entry.is_file()]
+                if PARTS_MANIFEST in file_names:
+                    # All parts are stored in a single NDJSON manifest; list them by part name
+                    source_files = list_parts_manifest(self.parts_dir)
+                    json_files = source_files
+                else:
+                    json_files = [name for name in file_names if name.endswith(".json")]
+                    source_files = [name[:-len(".json")] for name in json_files]
                 status["json_parts"] = {
                     "exists": True,
                     "count": len(json_files),
-                    "files": [f.name for f in json_files]
+                    "files": json_files
                 }
             else:
+                source_files = []
                 status["json_parts"] = {"exists": False, "count": 0, "files": []}
             
             # Check translation status
-            status["translation_status"] = get_translation_status(self.language)
+            status["translation_status"] = get_translation_status(self.language, source_files)
             
             # Check merge status
             status["merge_status"] = get_merge_status(self.language)
@@ -246,7 +289,8 @@ class TranslationPipeline:
             if (status["excel_source"]["exists"] and 
                 status["json_parts"]["exists"] and 
                 status["translation_status"].get("total_translated", 0) > 0):
-                if status["merge_status"].get("final_xlsx_exists", False):
+                if (status["merge_status"].get("final_xlsx_exists", False) or
+                    status["merge_status"].get("final_parquet_exists", False)):
                     status["overall_status"] = "complete"
                 else:
                     status["overall_status"] = "translated_ready_to_merge"
@@ -265,8 +309,8 @@ class TranslationPipeline:
 
 def print_pipeline_status(status: Dict):
     """Print pipeline status in a user-friendly format."""
-    print(f"\n📊 Pipeline Status for {status['language']}")
-    print("=" * 50)
+    # Collect all lines first and write them to stdout in one call
+    lines = [f"\n📊 Pipeline Status for {status['language']}", "=" * 50]
     
     # Overall status
     status_icons = {
@@ -280,46 +324,50 @@ def print_pipeline_status(status: Dict):
     
     overall_status = status.get("overall_status", "unknown")
     icon = status_icons.get(overall_status, "❓")
-    print(f"Overall Status: {icon} {overall_status.replace('_', ' ').title()}")
+    lines.append(f"Overall Status: {icon} {overall_status.replace('_', ' ').title()}")
     
     # Excel source
     excel = status.get("excel_source", {})
     if excel.get("exists"):
-        print(f"📁 Excel Source: ✅ {excel.get('path', 'Unknown')}")
+        lines.append(f"📁 Excel Source: ✅ {excel.get('path', 'Unknown')}")
     else:
-        print("📁 Excel Source: ❌ Not found")
+        lines.append("📁 Excel Source: ❌ Not found")
     
     # JSON parts
     parts = status.get("json_parts", {})
     if parts.get("exists"):
-        print(f"📋 JSON Parts: ✅ {parts.get('count', 0)} files")
+        lines.append(f"📋 JSON Parts: ✅ {parts.get('count', 0)} files")
         for file_name in parts.get("files", [])[:5]:  # Show first 5 files
-            print(f"   - {file_name}")
+            lines.append(f"   - {file_name}")
         if len(parts.get("files", [])) > 5:
-            print(f"   ... and {len(parts.get('files', [])) - 5} more")
+            lines.append(f"   ... and {len(parts.get('files', [])) - 5} more")
     else:
-        print("📋 JSON Parts: ❌ Not found")
+        lines.append("📋 JSON Parts: ❌ Not found")
     
     # Translation status
     trans = status.get("translation_status", {})
     if "error" not in trans:
-        print(f"🌐 Translation: {trans.get('total_translated', 0)}/{trans.get('total_source', 0)} files")
+        lines.append(f"🌐 Translation: {trans.get('total_translated', 0)}/{trans.get('total_source', 0)} files")
         if trans.get("pending_files"):
-            print(f"   Pending: {', '.join(trans.get('pending_files', [])[:3])}")
+            lines.append(f"   Pending: {', '.join(trans.get('pending_files', [])[:3])}")
             if len(trans.get("pending_files", [])) > 3:
-                print(f"   ... and {len(trans.get('pending_files', [])) - 3} more")
+                lines.append(f"   ... and {len(trans.get('pending_files', [])) - 3} more")
     else:
-        print(f"🌐 Translation: ❌ Error - {trans.get('error')}")
+        lines.append(f"🌐 Translation: ❌ Error - {trans.get('error')}")
     
     # Merge status
     merge = status.get("merge_status", {})
     if "error" not in merge:
         if merge.get("final_xlsx_exists"):
-            print("📊 Final Excel: ✅ Created")
+            lines.append("📊 Final Excel: ✅ Created")
+        elif merge.get("final_parquet_exists"):
+            lines.append("📊 Final Parquet: ✅ Created")
         else:
-            print("📊 Final Excel: ❌ Not created")
+            lines.append("📊 Final Excel: ❌ Not created")
     else:
-        print(f"📊 Final Excel: ❌ Error - {merge.get('error')}")
+        lines.append(f"📊 Final Excel: ❌ Error - {merge.get('error')}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Main entry point for the translation pipeline."""
@@ -340,9 +388,16 @@ def main():
                        help="Run full pipeline (Excel or JSON → JSON → Translate → Merge)")
     parser.add_argument("--input-type", "-t", default="json",
                        help="Input type (excel or json)")
+    parser.add_argument("--ndjson", action="store_true",
+                       help="Write JSON parts to a single parts.ndjson manifest instead of p1.json, p2.json, ...")
+    parser.add_argument("--in-memory", action="store_true",
+                       help="With --full, pass JSON parts to the translator in memory instead of writing parts/")
+    parser.add_argument("--parquet", action="store_true",
+                       help="With Excel input, merge translations to final.parquet instead of final.xlsx (requires pyarrow)")
     
     args = parser.parse_args()
     
+    log_listener = start_logging()
     try:
         # Check environment
         if not os.getenv("GEMINI_API_KEY"):
@@ -351,7 +406,8 @@ def main():
             sys.exit(1)
         
         # Initialize pipeline
-        pipeline = TranslationPipeline(args.language, args.input_type, args.items_per_part, args.max_lines_per_part)
+        pipeline = TranslationPipeline(args.language, args.input_type, args.items_per_part, args.max_lines_per_part,
+                                       parts_manifest=args.ndjson, parquet_output=args.parquet)
         
         # Show status only
         if args.status:
@@ -367,7 +423,7 @@ def main():
         elif args.full:
             # Full pipeline
             print(f"🚀 Running full translation pipeline")
-            results = pipeline.run_full_pipeline()
+            results = pipeline.run_full_pipeline(persist_parts=not args.in_memory)
         else:
             # Default: show status and ask what to do
             status = pipeline.get_pipeline_status()
@@ -390,7 +446,10 @@ def main():
                 return
             
             if status.get("overall_status") == "complete":
-                print("\n✅ Pipeline complete! Final Excel file created.")
+                if status["merge_status"].get("final_xlsx_exists"):
+                    print("\n✅ Pipeline complete! Final Excel file created.")
+                else:
+                    print("\n✅ Pipeline complete! Final Parquet file created.")
                 return
         
         # Show results
@@ -417,6 +476,8 @@ def main():
         print(f"\n❌ Unexpected error: {str(e)}")
         logger.error(f"Unexpected error: {str(e)}")
         sys.exit(1)
+    finally:
+        log_listener.stop()
 
 if __name__ == "__main__":
     main()
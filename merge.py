@@ -1,13 +1,119 @@
 import json
-import pandas as pd
+import os
+from operator import itemgetter
 from pathlib import Path
 import logging
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+from json_converter import dumps_json, loads_json
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Item count per JSON file, keyed by path and reused while the file's mtime and size are unchanged
+_item_counts: Dict[str, Tuple[int, int, int]] = {}
+
+def _count_items(entry: os.DirEntry) -> int:
+    """
+    Count the items in a JSON file, reparsing it only when it has changed since the last count.
+    
+    Args:
+        entry (os.DirEntry): Directory entry of the JSON file
+    
+    Returns:
+        int: Number of top-level items in the file
+    """
+    stat = entry.stat()
+    cached = _item_counts.get(entry.path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    
+    item_count = len(loads_json(Path(entry.path).read_bytes()))
+    _remember_item_count(entry.path, stat, item_count)
+    return item_count
+
+def _remember_item_count(path: str, stat: os.stat_result, item_count: int) -> None:
+    """Record a file's item count so status checks can skip reparsing it; stat must be taken before the file is read."""
+    _item_counts[path] = (stat.st_mtime_ns, stat.st_size, item_count)
+
+def _parse_one(json_file: Path) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Read and parse one JSON file.
+    
+    Args:
+        json_file (Path): JSON file to parse
+    
+    Returns:
+        tuple: (file name, parsed data or None, error message or None)
+    """
+    try:
+        return json_file.name, loads_json(json_file.read_bytes()), None
+    except json.JSONDecodeError as e:
+        return json_file.name, None, f"Error parsing {json_file.name}: {str(e)}"
+    except Exception as e:
+        return json_file.name, None, f"Error reading {json_file.name}: {str(e)}"
+
+def _load_json_files(json_files: List[Path]) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    Parse JSON files and merge them in file order.
+    
+    Args:
+        json_files (list): JSON files to merge
+    
+    Returns:
+        tuple: (merged key-value pairs, item count per file name)
+    """
+    all_data = {}
+    file_stats = {}
+    
+    for json_file in json_files:
+        # Stat before parsing so the count is recorded against the version of the file that was read
+        stat = json_file.stat()
+        name, data, error = _parse_one(json_file)
+        if error:
+            logger.error(error)
+            continue
+        
+        # Count items in this file, and keep the count for get_merge_status
+        item_count = len(data)
+        file_stats[name] = item_count
+        _remember_item_count(str(json_file), stat, item_count)
+        
+        # Add data to the main dictionary
+        # If there are duplicate keys, the later file will overwrite earlier ones
+        all_data.update(data)
+        
+        logger.info(f"Processed {name}: {item_count} items")
+    
+    return all_data, file_stats
+
+def _column_width(*columns) -> int:
+    """
+    Get an Excel column width that fits the longest value.
+    
+    Args:
+        *columns: Iterables of cell values (e.g. header and data) that share the column
+    
+    Returns:
+        int: Longest value length plus padding, capped at 100 characters
+    """
+    max_length = max((max(map(len, map(str, values)), default=0) for values in columns), default=0)
+    return min(max_length + 2, 100)
+
+def _cell_value(value: Any) -> Any:
+    """
+    Get a value openpyxl can write to a cell.
+    
+    Args:
+        value: Translated value; nested schema sections are dicts or lists
+    
+    Returns:
+        Scalars unchanged, anything else as its str() text (as pandas wrote it, and as _column_width sizes it)
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
 def merge_json_files_to_xlsx(language: str) -> bool:
     """
     Merge all JSON files in output/{language} folder to a single Excel file.
@@ -19,6 +125,9 @@ def merge_json_files_to_xlsx(language: str) -> bool:
         bool: True if successful, False otherwise
     """
     try:
+        # Imported here so that status checks and JSON merges don't pay for loading openpyxl
+        from openpyxl import Workbook
+        
         # Define paths
         input_dir = Path("output") / language
         output_file = input_dir / "final.xlsx"
@@ -40,92 +149,51 @@ def merge_json_files_to_xlsx(language: str) -> bool:
         
         logger.info(f"Found {len(json_files)} JSON files to merge")
         
-        # Dictionary to store all key-value pairs
-        all_data = {}
-        file_stats = {}
-        
-        # Process each JSON file
-        for json_file in json_files:
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Count items in this file
-                item_count = len(data)
-                file_stats[json_file.name] = item_count
-                
-                # Add data to the main dictionary
-                # If there are duplicate keys, the later file will overwrite earlier ones
-                all_data.update(data)
-                
-                logger.info(f"Processed {json_file.name}: {item_count} items")
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing {json_file.name}: {str(e)}")
-                continue
-            except Exception as e:
-                logger.error(f"Error reading {json_file.name}: {str(e)}")
-                continue
+        # Parse all JSON files and collect their key-value pairs
+        all_data, file_stats = _load_json_files(json_files)
         
         if not all_data:
             logger.error("No valid data found in any JSON files")
             return False
         
-        # Convert to DataFrame
-        df = pd.DataFrame([
-            {"Key": key, "Value": value} 
-            for key, value in all_data.items()
-        ])
+        # Sort by key for better organization, comparing keys only
+        sorted_items = sorted(all_data.items(), key=itemgetter(0))
         
-        # Sort by key for better organization
-        df = df.sort_values("Key").reset_index(drop=True)
+        # Summary rows
+        summary_rows = [
+            ('Total JSON files processed', len(json_files)),
+            ('Total unique keys', len(all_data)),
+            ('Total values', len(all_data)),
+            ('Output file', str(output_file))
+        ]
+        
+        # File details
+        summary_rows += [(f'Items in {filename}', count) for filename, count in file_stats.items()]
         
         # Create output directory if it doesn't exist
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Save to Excel
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            # Main data sheet
-            df.to_excel(writer, sheet_name='Translations', index=False)
-            
-            # Summary sheet
-            summary_data = {
-                'Metric': [
-                    'Total JSON files processed',
-                    'Total unique keys',
-                    'Total values',
-                    'Output file'
-                ],
-                'Value': [
-                    len(json_files),
-                    len(all_data),
-                    len(all_data),
-                    str(output_file)
-                ]
-            }
-            
-            # File details
-            for filename, count in file_stats.items():
-                summary_data['Metric'].append(f'Items in {filename}')
-                summary_data['Value'].append(count)
-            
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Auto-adjust column widths
-            for sheet_name in writer.sheets:
-                worksheet = writer.sheets[sheet_name]
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 100)  # Cap at 100 characters
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+        # Save to Excel, streaming rows through a write-only workbook
+        wb = Workbook(write_only=True)
+        
+        # Main data sheet; column widths are computed from the data up front
+        # because a write-only sheet cannot be revisited after rows are appended
+        ws_trans = wb.create_sheet('Translations')
+        ws_trans.column_dimensions['A'].width = _column_width(['Key'], all_data.keys())
+        ws_trans.column_dimensions['B'].width = _column_width(['Value'], all_data.values())
+        ws_trans.append(('Key', 'Value'))
+        for key, value in sorted_items:
+            ws_trans.append((key, _cell_value(value)))
+        
+        # Summary sheet
+        ws_summary = wb.create_sheet('Summary')
+        ws_summary.column_dimensions['A'].width = _column_width(['Metric'], (metric for metric, _ in summary_rows))
+        ws_summary.column_dimensions['B'].width = _column_width(['Value'], (value for _, value in summary_rows))
+        ws_summary.append(('Metric', 'Value'))
+        for row in summary_rows:
+            ws_summary.append(row)
+        
+        wb.save(output_file)
         
         logger.info(f"Successfully merged {len(json_files)} JSON files into {output_file}")
         logger.info(f"Total unique keys: {len(all_data)}")
@@ -177,32 +245,8 @@ def merge_json_files_to_final_json(language: str) -> bool:
         
         logger.info(f"Found {len(json_files)} JSON files to merge")
         
-        # Dictionary to store all key-value pairs
-        all_data = {}
-        file_stats = {}
-        
-        # Process each JSON file
-        for json_file in json_files:
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Count items in this file
-                item_count = len(data)
-                file_stats[json_file.name] = item_count
-                
-                # Add data to the main dictionary
-                # If there are duplicate keys, the later file will overwrite earlier ones
-                all_data.update(data)
-                
-                logger.info(f"Processed {json_file.name}: {item_count} items")
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing {json_file.name}: {str(e)}")
-                continue
-            except Exception as e:
-                logger.error(f"Error reading {json_file.name}: {str(e)}")
-                continue
+        # Parse all JSON files and collect their key-value pairs
+        all_data, file_stats = _load_json_files(json_files)
         
         if not all_data:
             logger.error("No valid data found in any JSON files")
@@ -212,8 +256,7 @@ def merge_json_files_to_final_json(language: str) -> bool:
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
         # Save to final.json
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_data, f, ensure_ascii=False, indent=2)
+        output_file.write_bytes(dumps_json(all_data, indent=True))
         
         logger.info(f"Successfully merged {len(json_files)} JSON files into {output_file}")
         logger.info(f"Total unique keys: {len(all_data)}")
@@ -233,6 +276,103 @@ def merge_json_files_to_final_json(language: str) -> bool:
         logger.error(f"Error merging JSON files: {str(e)}")
         return False
 
+def merge_json_files_to_parquet(language: str) -> bool:
+    """
+    Merge all JSON files in output/{language} folder to a final.parquet file.
+    Rows are streamed one JSON file at a time, so only the largest file's values are
+    held at once; the set of keys already written still grows with the whole merge.
+    Requires the optional pyarrow package.
+    
+    Args:
+        language (str): Language folder name (e.g., "japanese")
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.error("pyarrow is required for Parquet output (pip install pyarrow)")
+        return False
+    
+    try:
+        # Define paths
+        input_dir = Path("output") / language
+        output_file = input_dir / "final.parquet"
+        
+        # Check if input directory exists
+        if not input_dir.exists():
+            logger.error(f"Input directory not found: {input_dir}")
+            return False
+        
+        # Get all JSON files in the directory
+        json_files = [f for f in input_dir.glob("*.json") if f.name != "final.json"]
+        
+        if not json_files:
+            logger.warning(f"No JSON files found in {input_dir}")
+            return False
+        
+        logger.info(f"Found {len(json_files)} JSON files to merge")
+        
+        schema = pa.schema([("Key", pa.string()), ("Value", pa.string())])
+        seen_keys = set()
+        file_stats = {}
+        total_rows = 0
+        
+        # Write to a temporary file and only replace final.parquet once the merge succeeded,
+        # so a failed or empty merge leaves any previous output untouched
+        temp_file = output_file.with_name(output_file.name + ".tmp")
+        try:
+            # Walk the files last to first and skip keys already written, so that,
+            # as in the other merges, the later file wins for duplicate keys
+            with pq.ParquetWriter(temp_file, schema) as writer:
+                for json_file in reversed(json_files):
+                    stat = json_file.stat()
+                    name, data, error = _parse_one(json_file)
+                    if error:
+                        logger.error(error)
+                        continue
+                    
+                    file_stats[name] = len(data)
+                    _remember_item_count(str(json_file), stat, len(data))
+                    keys = []
+                    values = []
+                    for key, value in data.items():
+                        if key in seen_keys:
+                            continue
+                        seen_keys.add(key)
+                        keys.append(key)
+                        # Nested schema sections are stored as JSON text
+                        values.append(value if isinstance(value, str) else dumps_json(value).decode('utf-8').rstrip('\n'))
+                    
+                    writer.write_table(pa.Table.from_pydict({"Key": keys, "Value": values}, schema=schema))
+                    total_rows += len(keys)
+                    logger.info(f"Processed {name}: {len(data)} items")
+            
+            if not total_rows:
+                logger.error("No valid data found in any JSON files")
+                return False
+            
+            os.replace(temp_file, output_file)
+        finally:
+            temp_file.unlink(missing_ok=True)
+        
+        logger.info(f"Successfully merged {len(json_files)} JSON files into {output_file}")
+        logger.info(f"Total unique keys: {total_rows}")
+        
+        # Print summary
+        print(f"\n📊 Parquet Merge Summary for {language}:")
+        print(f"   JSON files processed: {len(json_files)}")
+        print(f"   Total unique keys: {total_rows}")
+        print(f"   Output file: {output_file}")
+        
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error merging JSON files: {str(e)}")
+        return False
+
 def get_merge_status(language: str, is_excel: bool = True) -> Dict:
     """
     Get the status of JSON files in a language folder.
@@ -257,6 +397,7 @@ def get_merge_status(language: str, is_excel: bool = True) -> Dict:
             "json_files": [],
             "total_items": 0,
             "final_xlsx_exists": False,
+            "final_parquet_exists": False,
             "can_merge": False,
             "final_json_exists": False
         }
@@ -265,15 +406,16 @@ def get_merge_status(language: str, is_excel: bool = True) -> Dict:
             return status
         
         # Get JSON files
-        json_files = list(input_dir.glob("*.json"))
-        json_files = [f for f in json_files if f.name != "final.xlsx"]
+        with os.scandir(input_dir) as entries:
+            json_files = [entry for entry in entries if entry.name.endswith(".json")]
         
         status["json_files"] = [f.name for f in json_files]
         status["total_files"] = len(json_files)
         
-        # Check if final.xlsx exists
+        # Check if final.xlsx (or the final.parquet written by --parquet) exists
         if is_excel:
             status["final_xlsx_exists"] = output_file.exists()
+            status["final_parquet_exists"] = (input_dir / "final.parquet").exists()
         else:
             status["final_json_exists"] = output_file.exists()
         
@@ -281,9 +423,7 @@ def get_merge_status(language: str, is_excel: bool = True) -> Dict:
         total_items = 0
         for json_file in json_files:
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    total_items += len(data)
+                total_items += _count_items(json_file)
             except:
                 continue
         
@@ -350,6 +490,7 @@ if __name__ == "__main__":
         print(f"JSON files: {status['total_files']}")
         print(f"Total items: {status['total_items']}")
         print(f"Final XLSX exists: {status['final_xlsx_exists']}")
+        print(f"Final Parquet exists: {status['final_parquet_exists']}")
         print(f"Final JSON exists: {status['final_json_exists']}")
         print(f"Can merge: {status['can_merge']}")
     else:
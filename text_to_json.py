@@ -1,4 +1,3 @@
-import json
 import re
 from pathlib import Path
 import logging
@@ -7,6 +6,16 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Patterns compiled once at import
+# Common AI response prefixes/suffixes, matched in a single pass
+_ARTIFACTS_RE = re.compile(
+    r'^(?:Here is the translation.*?:?\s*)?(?:Translation.*?:?\s*)?'
+    r'|\s*The translation is complete.*$',
+    re.IGNORECASE
+)
+# Blank lines
+_BLANK_RE = re.compile(r'\n\s*\n')
+
 def clean_ai_response_to_json(ai_response: str) -> str:
     """
     Convert Google AI's markdown-wrapped JSON response to clean JSON format.
@@ -19,14 +28,16 @@ def clean_ai_response_to_json(ai_response: str) -> str:
         dict: Cleaned JSON data
     """
     try:
-        # Remove markdown code blocks if present
-        # Pattern to match ```json ... ``` or ``` ... ```
-        markdown_pattern = r'```(?:json)?\s*\n?(.*?)\n?```'
-        match = re.search(markdown_pattern, ai_response, re.DOTALL)
+        # Remove markdown code blocks if present (```json ... ``` or ``` ... ```)
+        fence_start = ai_response.find('```')
+        fence_end = ai_response.rfind('```')
         
-        if match:
-            # Extract content between code blocks
-            json_content = match.group(1).strip()
+        if fence_start != -1 and fence_end > fence_start:
+            # Extract content between the first and last fence, skipping a "json" tag
+            content_start = fence_start + 3
+            if ai_response.startswith('json', content_start):
+                content_start += 4
+            json_content = ai_response[content_start:fence_end].strip()
             logger.info("Found markdown code blocks, extracted JSON content")
         else:
             # No markdown blocks found, use the entire response
@@ -53,12 +64,10 @@ def clean_common_artifacts(content: str) -> str:
         str: Cleaned content
     """
     # Remove common AI response prefixes/suffixes
-    content = re.sub(r'^Here is the translation.*?:?\s*', '', content, flags=re.IGNORECASE)
-    content = re.sub(r'^Translation.*?:?\s*', '', content, flags=re.IGNORECASE)
-    content = re.sub(r'\s*The translation is complete.*$', '', content, flags=re.IGNORECASE)
+    content = _ARTIFACTS_RE.sub('', content)
     
     # Remove extra whitespace and newlines
-    content = re.sub(r'\n\s*\n', '\n', content)
+    content = _BLANK_RE.sub('\n', content)
     content = content.strip()
     
     # Try to find JSON object boundaries
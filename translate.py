@@ -1,13 +1,15 @@
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv
 import asyncio
+import functools
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
 import logging
 from text_to_json import clean_ai_response_to_json, clean_common_artifacts
+from json_converter import PARTS_MANIFEST, dumps_json, dumps_part, list_parts_manifest, load_parts_manifest, loads_json
 # Load environment variables
 load_dotenv()
 
@@ -15,6 +17,14 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of translation requests in flight at once
+MAX_CONCURRENT_TRANSLATIONS = 8
+# Maximum number of JSON parts sent together in one translation request
+TRANSLATION_BATCH_SIZE = 4
+# Maximum source JSON characters per batched request; translated output runs about as
+# long as the source, so this keeps batch responses well under the model's output token limit
+MAX_BATCH_CHARS = 24000
+
 # Translation agent
 class TranslationAgent:
     def __init__(self):
@@ -28,38 +38,198 @@ class TranslationAgent:
             temperature=1
         )
     
+    async def request_translation(self, source_text: str, target_language: str) -> str:
+        """Translate text using the AI model; raises if the request fails"""
+        if not source_text or not source_text.strip():
+            return source_text
+        # Create translation prompt
+        prompt = f"""
+        Input text use JSON format. for example:
+        {{
+            "base_size": "Base size",
+            "transform": "Transform",
+            "navigation": "Navigation",
+            "letter_spacing": "Letter spacing",
+            "buttons": "Buttons"
+        }}
+        
+        Keep original key and replace value with the translated text.
+
+        Translate the following text to {target_language}. 
+        Maintain the original meaning and context. 
+        Return only the translated text, nothing else.
+
+        
+        Text to translate: {source_text}
+        """
+        
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        return response.content.strip()
+    
     async def translate(self, source_text: str, target_language: str) -> str:
         """Translate text using the AI model"""
         try:
-            if not source_text or not source_text.strip():
-                return source_text
-            # Create translation prompt
-            prompt = f"""
-            Input text use JSON format. for example:
-            {{
-                "base_size": "Base size",
-                "transform": "Transform",
-                "navigation": "Navigation",
-                "letter_spacing": "Letter spacing",
-                "buttons": "Buttons"
-            }}
-            
-            Keep original key and replace value with the translated text.
-
-            Translate the following text to {target_language}. 
-            Maintain the original meaning and context. 
-            Return only the translated text, nothing else.
-
-            
-            Text to translate: {source_text}
-            """
-            
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
-            return response.content.strip()
-            
+            return await self.request_translation(source_text, target_language)
         except Exception as e:
             logger.error(f"Translation error: {str(e)}")
             return source_text  # Return original text if translation fails
+    
+    async def translate_batch(self, source_texts: List[str], target_language: str) -> List[Optional[str]]:
+        """
+        Translate several JSON texts in one request.
+        
+        Args:
+            source_texts (list): JSON texts to translate
+            target_language (str): Target language
+        
+        Returns:
+            list: Translated JSON text per source text, None for items missing from the response
+        
+        Raises:
+            Exception: If the request fails or the response is not a readable JSON array
+        """
+        # Send JSON parts as objects so the model doesn't have to return escaped JSON strings
+        items = []
+        for item_id, source_text in enumerate(source_texts):
+            try:
+                items.append({"id": item_id, "text": loads_json(source_text)})
+            except json.JSONDecodeError:
+                items.append({"id": item_id, "text": source_text})
+        
+        # Create batch translation prompt
+        prompt = f"""
+        Input is a JSON array of items with "id" and "text" fields. for example:
+        [
+            {{"id": 0, "text": {{"base_size": "Base size", "transform": "Transform"}}}},
+            {{"id": 1, "text": {{"letter_spacing": "Letter spacing", "buttons": "Buttons"}}}}
+        ]
+        
+        In every "text", keep original key and replace value with the translated text.
+
+        Translate every "text" to {target_language}. 
+        Maintain the original meaning and context. 
+        Return only a JSON array of items with the same "id" and a "translation" field, nothing else.
+
+        
+        Items to translate: {dumps_json(items).decode('utf-8')}
+        """
+        
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        results = loads_json(clean_ai_response_to_json(response.content.strip()))
+        if not isinstance(results, list):
+            raise ValueError("Batch response is not a JSON array")
+        translations = {result["id"]: result["translation"] for result in results}
+        
+        return [
+            None if translation is None else translation if isinstance(translation, str) else dumps_part(translation)
+            for translation in map(translations.get, range(len(source_texts)))
+        ]
+
+@functools.lru_cache(maxsize=64)
+def _scan_json_stems(directory: str, mtime_ns: int) -> Tuple[str, ...]:
+    """Scan a directory for JSON files; mtime_ns keys the cache so a changed listing is rescanned."""
+    with os.scandir(directory) as entries:
+        return tuple(entry.name[:-len(".json")] for entry in entries if entry.name.endswith(".json"))
+
+def _json_stems(directory: Path) -> Tuple[str, ...]:
+    """Get the names (without extension) of the JSON files in a directory, cached until it changes."""
+    return _scan_json_stems(str(directory), directory.stat().st_mtime_ns)
+
+async def _translate_to_file(agent: TranslationAgent, source_data: str, language: str, output_file: Path) -> None:
+    """Translate a JSON string and save the cleaned AI response to output_file."""
+    _save_translation(await agent.translate(source_data, language), output_file)
+
+def _save_translation(translated_value: str, output_file: Path) -> None:
+    """Clean an AI translation and save it to output_file."""
+    translated_value = clean_ai_response_to_json(translated_value)
+    translated_value = clean_common_artifacts(translated_value)
+    
+    # Save translated data, re-serialized when the response is valid JSON
+    try:
+        output_file.write_bytes(dumps_json(loads_json(translated_value), indent=True))
+    except json.JSONDecodeError:
+        logger.warning(f"Translated response for {output_file.name} is not valid JSON, saving it unchanged")
+        output_file.write_text(translated_value, encoding='utf-8')
+
+def _batch_jobs(jobs: List[Tuple[str, str, Path]], batch_size: int, max_chars: int) -> List[List[Tuple[str, str, Path]]]:
+    """
+    Group translation jobs into batches of at most batch_size jobs and max_chars source characters.
+    A job larger than max_chars on its own is sent alone.
+    
+    Args:
+        jobs (list): (name, source JSON text, output file) tuples
+        batch_size (int): Maximum number of jobs per batch
+        max_chars (int): Maximum total source JSON characters per batch
+    
+    Returns:
+        list: Batches of jobs, in job order
+    """
+    batches = []
+    batch = []
+    batch_chars = 0
+    for job in jobs:
+        job_chars = len(job[1])
+        if batch and (len(batch) >= batch_size or batch_chars + job_chars > max_chars):
+            batches.append(batch)
+            batch = []
+            batch_chars = 0
+        batch.append(job)
+        batch_chars += job_chars
+    if batch:
+        batches.append(batch)
+    return batches
+
+async def _translate_many(jobs: List[Tuple[str, str, Path]], language: str,
+                          max_concurrency: int = MAX_CONCURRENT_TRANSLATIONS,
+                          batch_size: int = TRANSLATION_BATCH_SIZE,
+                          max_batch_chars: int = MAX_BATCH_CHARS) -> int:
+    """
+    Translate several JSON strings concurrently with a single translation agent.
+    Jobs are sent in batches capped by count and source size. Items missing from a
+    valid batch response are retried with one request each; a failed batch request
+    fails all of its jobs rather than fanning out into per-item requests.
+    
+    Args:
+        jobs (list): (name, source JSON text, output file) tuples
+        language (str): Target language
+        max_concurrency (int): Maximum number of requests in flight at once
+        batch_size (int): Maximum number of jobs sent together in one request
+        max_batch_chars (int): Maximum source JSON characters sent together in one request
+    
+    Returns:
+        int: Number of jobs translated successfully
+    """
+    # One agent per event loop: the Gemini client's async transport is bound to the loop it first runs on
+    agent = TranslationAgent()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def translate_batch(batch: List[Tuple[str, str, Path]]) -> int:
+        async with semaphore:
+            if len(batch) > 1:
+                try:
+                    translations = await agent.translate_batch([source_data for _, source_data, _ in batch], language)
+                except Exception as e:
+                    logger.error(f"Failed to translate batch {', '.join(name for name, _, _ in batch)}: {str(e)}")
+                    return 0
+            else:
+                translations = [None]
+            
+            success_count = 0
+            for (name, source_data, output_file), translated_value in zip(batch, translations):
+                try:
+                    if translated_value is None:
+                        # Unlike translate(), a failed request raises so the job counts as failed
+                        _save_translation(await agent.request_translation(source_data, language), output_file)
+                    else:
+                        _save_translation(translated_value, output_file)
+                    success_count += 1
+                except Exception as e:
+                    logger.error(f"Failed to translate {name}: {str(e)}")
+            return success_count
+    
+    batches = _batch_jobs(jobs, batch_size, max_batch_chars)
+    results = await asyncio.gather(*(translate_batch(batch) for batch in batches))
+    return sum(results)
 
 def translate_single_json_file(language: str, file_name: str) -> bool:
     """
@@ -74,37 +244,43 @@ def translate_single_json_file(language: str, file_name: str) -> bool:
     """
     try:
         # Define file paths
-        source_file = Path("parts") / language / f"{file_name}.json"
+        parts_dir = Path("parts") / language
+        source_file = parts_dir / f"{file_name}.json"
+        manifest_file = parts_dir / PARTS_MANIFEST
         output_dir = Path("output") / language
         output_file = output_dir / f"{file_name}.json"
         
-        # Check if source file exists
-        if not source_file.exists():
-            logger.error(f"Source file not found: {source_file}")
-            return False
+        # Load source JSON, from the NDJSON parts manifest when one was written
+        try:
+            parts = load_parts_manifest(parts_dir)
+        except FileNotFoundError:
+            parts = None
+        
+        if parts is not None:
+            part_data = parts.get(file_name)
+            if part_data is None:
+                logger.error(f"Part {file_name} not found in {manifest_file}")
+                return False
+            source_data = dumps_part(part_data)
+            source_file = manifest_file
+        else:
+            try:
+                source_bytes = source_file.read_bytes()
+            except FileNotFoundError:
+                logger.error(f"Source file not found: {source_file}")
+                return False
+            # Decoded only for the prompt
+            source_data: str = source_bytes.decode('utf-8')
         
         # Create output directory
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Load source JSON
-        with open(source_file, 'r', encoding='utf-8') as f:
-            # Load string from file
-            source_data: str = f.read()
-        
         logger.info(f"Translating {source_file} to {language}")
         
         # Initialize translation agent
         agent = TranslationAgent()
         
-
-        translated_value = asyncio.run(agent.translate(source_data, language))
-               
-        
-        # Save translated data
-        with open(output_file, 'w', encoding='utf-8') as f:
-            translated_value = clean_ai_response_to_json(translated_value)
-            translated_value = clean_common_artifacts(translated_value)
-            f.write(translated_value)
+        asyncio.run(_translate_to_file(agent, source_data, language, output_file))
         
         logger.info(f"Translation complete: {output_file}")
         return True
@@ -132,6 +308,10 @@ def translate_all_json_files(language: str) -> bool:
             logger.error(f"Parts directory not found: {parts_dir}")
             return False
         
+        # Parts written as a single NDJSON manifest are translated straight from memory
+        if (parts_dir / PARTS_MANIFEST).exists():
+            return translate_all_dicts(language, list(load_parts_manifest(parts_dir).values()))
+        
         # Get all JSON files
         json_files = list(parts_dir.glob("*.json"))
         # sort json files by name
@@ -146,14 +326,12 @@ def translate_all_json_files(language: str) -> bool:
         
         logger.info(f"Found {len(json_files)} JSON files to translate")
         
-        # Translate each file
-        success_count = 0
-        for json_file in json_files:
-            file_name = json_file.stem  # Get filename without extension
-            if translate_single_json_file(language, file_name):
-                success_count += 1
-            else:
-                logger.error(f"Failed to translate {file_name}")
+        # Translate all files concurrently
+        jobs = [
+            (json_file.stem, json_file.read_text(encoding='utf-8'), output_dir / json_file.name)
+            for json_file in json_files
+        ]
+        success_count = asyncio.run(_translate_many(jobs, language))
         
         logger.info(f"Translation complete: {success_count}/{len(json_files)} files successful")
         return success_count == len(json_files)
@@ -162,12 +340,52 @@ def translate_all_json_files(language: str) -> bool:
         logger.error(f"Error translating all files: {str(e)}")
         return False
 
-def get_translation_status(language: str) -> Dict[str, Any]:
+def translate_all_dicts(language: str, parts: List[Dict[str, Any]]) -> bool:
+    """
+    Translate in-memory JSON parts without reading them from the parts folder.
+    Part N is saved as output/{language}/pN.json, the same layout translate_all_json_files produces.
+    
+    Args:
+        language (str): Language folder name (e.g., "japanese")
+        parts (list): Part dictionaries, in part order
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        output_dir = Path("output") / language
+        
+        if not parts:
+            logger.warning("No JSON parts to translate")
+            return True
+        
+        # Create output directory
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        logger.info(f"Translating {len(parts)} in-memory JSON parts to {language}")
+        
+        # Translate all parts concurrently
+        jobs = [
+            (f"p{part_num}", dumps_part(part_data), output_dir / f"p{part_num}.json")
+            for part_num, part_data in enumerate(parts, 1)
+        ]
+        success_count = asyncio.run(_translate_many(jobs, language))
+        
+        logger.info(f"Translation complete: {success_count}/{len(parts)} parts successful")
+        return success_count == len(parts)
+        
+    except Exception as e:
+        logger.error(f"Error translating in-memory parts: {str(e)}")
+        return False
+
+def get_translation_status(language: str, source_files: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Get the status of translation files for a specific language.
     
     Args:
         language (str): Language folder name
+        source_files (list): Optional pre-scanned source file names (without extension);
+            when omitted the parts folder is scanned
     
     Returns:
         dict: Status information
@@ -187,16 +405,20 @@ def get_translation_status(language: str) -> Dict[str, Any]:
         }
         
         # Get source files
-        if parts_dir.exists():
-            source_files = list(parts_dir.glob("*.json"))
-            status["source_files"] = [f.stem for f in source_files]
+        if source_files is not None:
+            status["source_files"] = list(source_files)
             status["total_source"] = len(source_files)
+        elif (parts_dir / PARTS_MANIFEST).exists():
+            status["source_files"] = list_parts_manifest(parts_dir)
+            status["total_source"] = len(status["source_files"])
+        elif parts_dir.exists():
+            status["source_files"] = list(_json_stems(parts_dir))
+            status["total_source"] = len(status["source_files"])
         
         # Get translated files
         if output_dir.exists():
-            translated_files = list(output_dir.glob("*.json"))
-            status["translated_files"] = [f.stem for f in translated_files]
-            status["total_translated"] = len(translated_files)
+            status["translated_files"] = list(_json_stems(output_dir))
+            status["total_translated"] = len(status["translated_files"])
         
         # Calculate pending files
         status["pending_files"] = list(set(status["source_files"]) - set(status["translated_files"]))